@@ -1,4 +1,5 @@
 import aiofiles
+import aiofiles.os
 import aiohttp
 import asyncio
 import binascii
@@ -129,8 +130,13 @@ class Helper():
         async with aiohttp.ClientSession() as session:
             async with session.get(source) as response:
                 if response.status == 200:
-                    async with aiofiles.open(dest, mode='wb') as f:
-                        await f.write(await response.read())
+                    # Stream into a temporary file so an interrupted download
+                    # never leaves a truncated file at dest
+                    tmp_dest = dest + '.part'
+                    async with aiofiles.open(tmp_dest, mode='wb') as f:
+                        async for chunk in response.content.iter_chunked(65536):
+                            await f.write(chunk)
+                    await aiofiles.os.replace(tmp_dest, dest)
                 else:
                     raise Exception("File not found")
 
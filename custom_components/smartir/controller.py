@@ -67,6 +67,10 @@ class AbstractController(ABC):
 class BroadlinkController(AbstractController):
     """Controls a Broadlink device."""
 
+    def __init__(self, hass, controller, encoding, controller_data, delay):
+        super().__init__(hass, controller, encoding, controller_data, delay)
+        self._converted_commands = {}
+
     def check_encoding(self, encoding):
         """Check if the encoding is supported by the controller."""
         if encoding not in BROADLINK_COMMANDS_ENCODING:
@@ -81,6 +85,12 @@ class BroadlinkController(AbstractController):
             command = [command]
 
         for _command in command:
+            if _command in self._converted_commands:
+                commands.append(self._converted_commands[_command])
+                continue
+
+            raw_command = _command
+
             if self._encoding == ENC_HEX:
                 try:
                     _command = binascii.unhexlify(_command)
@@ -100,7 +110,9 @@ class BroadlinkController(AbstractController):
                     raise Exception("Error while converting "
                                     "Pronto to Base64 encoding")
 
-            commands.append('b64:' + _command)
+            _command = 'b64:' + _command
+            self._converted_commands[raw_command] = _command
+            commands.append(_command)
 
         service_data = {
             ATTR_ENTITY_ID: self._controller_data,
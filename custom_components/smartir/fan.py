@@ -1,5 +1,8 @@
 import asyncio
 import aiofiles
+import aiofiles.os
+from bisect import bisect_left
+from dataclasses import dataclass
 import json
 import logging
 import os.path
@@ -16,17 +19,19 @@ from homeassistant.const import (
 from homeassistant.core import Event, EventStateChangedData, callback
 from homeassistant.helpers.event import async_track_state_change_event
 import homeassistant.helpers.config_validation as cv
-from homeassistant.helpers.restore_state import RestoreEntity
-from homeassistant.util.percentage import (
-    ordered_list_item_to_percentage,
-    percentage_to_ordered_list_item
-)
+from homeassistant.helpers.restore_state import RestoreEntity, RestoredExtraData
 
 from . import COMPONENT_ABS_DIR, Helper
 from .controller import get_controller
 
 _LOGGER = logging.getLogger(__name__)
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 DEFAULT_NAME = "SmartIR Fan"
 DEFAULT_DELAY = 0.5
 
@@ -38,12 +43,43 @@ CONF_POWER_SENSOR = 'power_sensor'
 
 SPEED_OFF = "off"
 
+DEVICE_FILES_ABSDIR = os.path.join(COMPONENT_ABS_DIR, 'codes', 'fan')
+
+_UNSET = object()
+
+# Parsed device files keyed by (path, mtime_ns). DeviceData is frozen, so a
+# single instance is shared between entities.
+_DEVICE_CACHE = {}
+
+
+@dataclass(frozen=True, slots=True)
+class DeviceData:
+    """Contents of a fan device file."""
+    manufacturer: str
+    supported_models: list
+    supported_controller: str
+    commands_encoding: str
+    speed: list
+    commands: dict
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(
+            manufacturer=data['manufacturer'],
+            supported_models=data['supportedModels'],
+            supported_controller=data['supportedController'],
+            commands_encoding=data['commandsEncoding'],
+            speed=data['speed'],
+            commands=data['commands'],
+        )
+
+
 PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend({
     vol.Optional(CONF_UNIQUE_ID): cv.string,
     vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
     vol.Required(CONF_DEVICE_CODE): cv.positive_int,
     vol.Required(CONF_CONTROLLER_DATA): cv.string,
-    vol.Optional(CONF_DELAY, default=DEFAULT_DELAY): cv.string,
+    vol.Optional(CONF_DELAY, default=DEFAULT_DELAY): cv.positive_float,
     vol.Optional(CONF_POWER_SENSOR): cv.entity_id
 })
 
@@ -51,16 +87,15 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend({
 async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
     """Set up the IR Fan platform."""
     device_code = config.get(CONF_DEVICE_CODE)
-    device_files_subdir = os.path.join('codes', 'fan')
-    device_files_absdir = os.path.join(COMPONENT_ABS_DIR, device_files_subdir)
 
-    if not os.path.isdir(device_files_absdir):
-        os.makedirs(device_files_absdir)
+    await aiofiles.os.makedirs(DEVICE_FILES_ABSDIR, exist_ok=True)
 
-    device_json_filename = str(device_code) + '.json'
-    device_json_path = os.path.join(device_files_absdir, device_json_filename)
+    device_json_path = f"{DEVICE_FILES_ABSDIR}{os.sep}{device_code}.json"
 
-    if not os.path.exists(device_json_path):
+    try:
+        device_stat = await aiofiles.os.stat(device_json_path)
+    except FileNotFoundError:
+        device_stat = None
         _LOGGER.warning(
             "Couldn't find the device Json file. The component will "
             "try to download it from the GitHub repo."
@@ -83,11 +118,7 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
             return
 
     try:
-        async with aiofiles.open(device_json_path, mode='r') as j:
-            _LOGGER.debug(f"loading json file {device_json_path}")
-            content = await j.read()
-            device_data = json.loads(content)
-            _LOGGER.debug(f"{device_json_path} file loaded")
+        device_data = await _async_load_device_data(device_json_path, device_stat)
     except Exception:
         _LOGGER.error("The device JSON file is invalid")
         return
@@ -95,6 +126,31 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
     async_add_entities([SmartIRFan(hass, config, device_data)])
 
 
+async def _async_load_device_data(device_json_path, stat=None):
+    """Load a device file, reusing the parsed data if it is unchanged."""
+    if stat is None:
+        stat = await aiofiles.os.stat(device_json_path)
+    key = (device_json_path, stat.st_mtime_ns)
+
+    device_data = _DEVICE_CACHE.get(key)
+    if device_data is not None:
+        _LOGGER.debug(f"using cached json file {device_json_path}")
+        return device_data
+
+    async with aiofiles.open(device_json_path, mode='rb') as j:
+        _LOGGER.debug(f"loading json file {device_json_path}")
+        content = await j.read()
+        device_data = DeviceData.from_json(_loads(content))
+        _LOGGER.debug(f"{device_json_path} file loaded")
+
+    # Drop entries for older versions of the same file
+    for cached_key in [k for k in _DEVICE_CACHE if k[0] == device_json_path]:
+        del _DEVICE_CACHE[cached_key]
+
+    _DEVICE_CACHE[key] = device_data
+    return device_data
+
+
 class SmartIRFan(FanEntity, RestoreEntity):
     def __init__(self, hass, config, device_data):
         self.hass = hass
@@ -105,12 +161,20 @@ class SmartIRFan(FanEntity, RestoreEntity):
         self._delay = config.get(CONF_DELAY)
         self._power_sensor = config.get(CONF_POWER_SENSOR)
 
-        self._manufacturer = device_data['manufacturer']
-        self._supported_models = device_data['supportedModels']
-        self._supported_controller = device_data['supportedController']
-        self._commands_encoding = device_data['commandsEncoding']
-        self._speed_list = device_data['speed']
-        self._commands = device_data['commands']
+        self._manufacturer = device_data.manufacturer
+        self._supported_models = device_data.supported_models
+        self._supported_controller = device_data.supported_controller
+        self._commands_encoding = device_data.commands_encoding
+        self._speed_list = device_data.speed
+        self._commands = device_data.commands
+
+        # Same mapping as homeassistant.util.percentage, computed once
+        speed_count = len(self._speed_list)
+        self._pct_boundaries = [
+            (position * 100) // speed_count
+            for position in range(1, speed_count + 1)
+        ]
+        self._speed_to_pct = dict(zip(self._speed_list, self._pct_boundaries))
 
         self._speed = SPEED_OFF
         self._direction = None
@@ -124,17 +188,45 @@ class SmartIRFan(FanEntity, RestoreEntity):
             | FanEntityFeature.TURN_ON
         )
 
-        if (
-            DIRECTION_REVERSE in self._commands
-            and DIRECTION_FORWARD in self._commands
-        ):
+        cmd_keys = frozenset(self._commands)
+        has_oscillate = "oscillate" in cmd_keys
+
+        if {DIRECTION_REVERSE, DIRECTION_FORWARD} <= cmd_keys:
             self._direction = DIRECTION_REVERSE
             self._attr_supported_features |= FanEntityFeature.DIRECTION
 
-        if "oscillate" in self._commands:
+        if has_oscillate:
             self._oscillating = False
             self._attr_supported_features |= FanEntityFeature.OSCILLATE
 
+        # Flatten the commands into (speed, direction, oscillating) -> command
+        self._cmd_table = {}
+        for direction in (DIRECTION_FORWARD, DIRECTION_REVERSE, "default"):
+            if direction not in cmd_keys:
+                continue
+
+            for oscillating in (False, True):
+                self._cmd_table[(SPEED_OFF, direction, oscillating)] = self._commands["off"]
+
+            for speed in self._speed_list:
+                if speed in self._commands[direction]:
+                    self._cmd_table[(speed, direction, False)] = self._commands[direction][speed]
+                if has_oscillate:
+                    self._cmd_table[(speed, direction, True)] = self._commands["oscillate"]
+
+            # Speed is None while the fan was turned on by its own remote
+            if has_oscillate:
+                self._cmd_table[(None, direction, True)] = self._commands["oscillate"]
+
+        self._attr_extra_state_attributes = {
+            "last_on_speed": self._last_on_speed,
+            "device_code": self._device_code,
+            "manufacturer": self._manufacturer,
+            "supported_models": self._supported_models,
+            "supported_controller": self._supported_controller,
+            "commands_encoding": self._commands_encoding,
+        }
+
         self._temp_lock = asyncio.Lock()
         self._on_by_remote = False
 
@@ -150,27 +242,40 @@ class SmartIRFan(FanEntity, RestoreEntity):
     async def async_added_to_hass(self):
         await super().async_added_to_hass()
 
-        last_state = await self.async_get_last_state()
+        last_data = await self.async_get_last_extra_data()
 
-        if last_state is not None:
-            if "speed" in last_state.attributes:
-                self._speed = last_state.attributes["speed"]
+        if last_data is not None:
+            last_data = last_data.as_dict()
+            speed = last_data.get("speed", SPEED_OFF)
+            if speed != SPEED_OFF and speed not in self._speed_to_pct:
+                speed = SPEED_OFF
+            self._speed = speed
 
             if (
-                "direction" in last_state.attributes
+                last_data.get("direction") is not None
                 and self._attr_supported_features & FanEntityFeature.DIRECTION
             ):
-                self._direction = last_state.attributes["direction"]
+                self._direction = last_data["direction"]
 
-            if "last_on_speed" in last_state.attributes:
-                self._last_on_speed = last_state.attributes["last_on_speed"]
+            self._last_on_speed = last_data.get("last_on_speed")
+            self._attr_extra_state_attributes["last_on_speed"] = self._last_on_speed
 
-            if self._power_sensor:
+        if self._power_sensor:
+            self.async_on_remove(
                 async_track_state_change_event(
                     self.hass,
-                    self._power_sensor,
+                    [self._power_sensor],
                     self._async_power_sensor_changed,
                 )
+            )
+
+    @property
+    def extra_restore_state_data(self):
+        return RestoredExtraData({
+            "speed": self._speed,
+            "direction": self._direction,
+            "last_on_speed": self._last_on_speed,
+        })
 
     @property
     def unique_id(self):
@@ -181,17 +286,15 @@ class SmartIRFan(FanEntity, RestoreEntity):
         return self._name
 
     @property
-    def state(self):
-        if (self._on_by_remote or self._speed != SPEED_OFF):
-            return STATE_ON
-        return SPEED_OFF
+    def is_on(self):
+        return self._on_by_remote or self._speed != SPEED_OFF
 
     @property
     def percentage(self):
         if self._speed == SPEED_OFF:
             return 0
 
-        return ordered_list_item_to_percentage(self._speed_list, self._speed)
+        return self._speed_to_pct.get(self._speed)
 
     @property
     def speed_count(self):
@@ -209,51 +312,62 @@ class SmartIRFan(FanEntity, RestoreEntity):
     def last_on_speed(self):
         return self._last_on_speed
 
-    @property
-    def extra_state_attributes(self):
-        return {
-            "last_on_speed": self._last_on_speed,
-            "device_code": self._device_code,
-            "manufacturer": self._manufacturer,
-            "supported_models": self._supported_models,
-            "supported_controller": self._supported_controller,
-            "commands_encoding": self._commands_encoding,
-        }
-
-    async def async_set_percentage(self, percentage: int):
+    def _percentage_to_speed(self, percentage):
         if percentage == 0:
-            self._speed = SPEED_OFF
-        else:
-            self._speed = percentage_to_ordered_list_item(
-                self._speed_list, percentage
-            )
+            return SPEED_OFF
 
-        if self._speed != SPEED_OFF:
-            self._last_on_speed = self._speed
+        speed_list = self._speed_list
+        index = bisect_left(self._pct_boundaries, percentage)
+        return speed_list[min(index, len(speed_list) - 1)]
 
-        await self.send_command()
-        self.async_write_ha_state()
+    async def _apply(self, *, speed=_UNSET, direction=_UNSET, oscillating=_UNSET):
+        """Update fan attributes with a single IR send and state write.
 
-    async def async_oscillate(self, oscillating: bool):
-        self._oscillating = oscillating
-        await self.send_command()
-        self.async_write_ha_state()
+        Does nothing if only the speed is given and it is unchanged.
+        """
+        send = False
 
-    async def async_set_direction(self, direction: str):
-        self._direction = direction
+        if speed is not _UNSET and speed != self._speed:
+            self._speed = speed
+            send = True
+
+            if speed != SPEED_OFF:
+                self._last_on_speed = speed
+                self._attr_extra_state_attributes["last_on_speed"] = speed
+        elif direction is _UNSET and oscillating is _UNSET:
+            return
 
-        if self._speed != SPEED_OFF:
+        if direction is not _UNSET:
+            self._direction = direction
+            send = send or self._speed != SPEED_OFF
+
+        if oscillating is not _UNSET:
+            self._oscillating = oscillating
+            send = send or self._speed != SPEED_OFF
+
+        if send:
             await self.send_command()
 
         self.async_write_ha_state()
 
+    async def async_set_percentage(self, percentage: int):
+        await self._apply(speed=self._percentage_to_speed(percentage))
+
+    async def async_oscillate(self, oscillating: bool):
+        await self._apply(oscillating=oscillating)
+
+    async def async_set_direction(self, direction: str):
+        await self._apply(direction=direction)
+
     async def async_turn_on(self, percentage=None, preset_mode=None, **kwargs):
         if percentage is None:
-            percentage = ordered_list_item_to_percentage(
-                self._speed_list, self._last_on_speed or self._speed_list[0]
-            )
+            speed = self._last_on_speed
+            if speed not in self._speed_to_pct:
+                speed = self._speed_list[0]
+        else:
+            speed = self._percentage_to_speed(percentage)
 
-        await self.async_set_percentage(percentage)
+        await self._apply(speed=speed)
 
     async def async_turn_off(self):
         await self.async_set_percentage(0)
@@ -261,16 +375,9 @@ class SmartIRFan(FanEntity, RestoreEntity):
     async def send_command(self):
         async with self._temp_lock:
             self._on_by_remote = False
-            speed = self._speed
-            direction = self._direction or "default"
-            oscillating = self._oscillating
-
-            if speed == SPEED_OFF:
-                command = self._commands["off"]
-            elif oscillating:
-                command = self._commands["oscillate"]
-            else:
-                command = self._commands[direction][speed]
+            command = self._cmd_table[
+                (self._speed, self._direction or "default", bool(self._oscillating))
+            ]
 
             try:
                 await self._controller.send(command)
@@ -279,22 +386,22 @@ class SmartIRFan(FanEntity, RestoreEntity):
 
     @callback
     async def _async_power_sensor_changed(self, event: Event[EventStateChangedData]):
-        entity_id = event.data["entity_id"]
-        old_state = event.data["old_state"]
         new_state = event.data["new_state"]
-
         if new_state is None:
             return
 
-        if new_state.state == old_state.state:
+        old_state = event.data["old_state"]
+        if old_state is not None and new_state.state == old_state.state:
             return
 
-        if new_state.state == STATE_ON and self._speed == SPEED_OFF:
+        state = new_state.state
+
+        if state == STATE_ON and self._speed == SPEED_OFF:
             self._on_by_remote = True
             self._speed = None
             self.async_write_ha_state()
 
-        if new_state.state == STATE_OFF:
+        if state == STATE_OFF:
             self._on_by_remote = False
             if self._speed != SPEED_OFF:
                 self._speed = SPEED_OFF